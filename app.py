@@ -1,7 +1,9 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import sys
 import os
+import hmac
+import json
 from pathlib import Path
 
 # Add parent directory to path
@@ -9,9 +11,22 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from predict import FakeNewsPredictor
 from src.logger import logging
+from src.profiler import format_collapsed, sample_stacks
 
 app = Flask(__name__)
 
+# Number of streamed texts scored together in one vectorized call
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 32))
+
+# Longest NDJSON line accepted by the streaming endpoint, in bytes
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", 1024 * 1024))
+
+# The sampling profiler endpoint is disabled unless explicitly enabled,
+# and callers must send PROFILER_TOKEN in the X-Profiler-Token header
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILER_ENABLED = os.getenv("ENABLE_PROFILER", "").lower() in ("1", "true", "yes")
+PROFILER_MAX_SECONDS = 60
+
 # Configure CORS with explicit origins
 # For deployment, allow CORS on API endpoints. Use a permissive policy here
 # to ensure browser preflight requests receive proper headers. For stricter
@@ -27,9 +42,20 @@ def add_cors_headers(response):
     response.headers.setdefault('Access-Control-Allow-Headers', 'Content-Type, Authorization')
     return response
 
+if PROFILER_ENABLED and not PROFILER_TOKEN:
+    logging.warning("ENABLE_PROFILER is set without PROFILER_TOKEN, profiler stays disabled")
+    PROFILER_ENABLED = False
+
 # Initialize the predictor
 try:
-    predictor = FakeNewsPredictor()
+    # MODEL_PATH can point at a compacted model (see compact_model.py)
+    # CASCADE_CONFIG enables early-exit scoring (see calibrate_cascade.py)
+    predictor = FakeNewsPredictor(
+        os.getenv("MODEL_PATH", "models/fake_news_model.pkl"),
+        cascade_path=os.getenv("CASCADE_CONFIG"),
+        # SHADOW_MODEL_PATH scores a candidate model in the background
+        shadow_model_path=os.getenv("SHADOW_MODEL_PATH")
+    )
     logging.info("✓ Flask API initialized successfully")
 except Exception as e:
     logging.error(f"Failed to initialize predictor: {str(e)}")
@@ -39,7 +65,10 @@ except Exception as e:
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'message': 'API is running'})
+    response = {'status': 'healthy', 'message': 'API is running'}
+    if predictor.shadow is not None:
+        response['shadow'] = predictor.shadow.stats()
+    return jsonify(response)
 
 
 @app.route('/api/predict', methods=['POST'])
@@ -70,6 +99,7 @@ def predict():
             'prediction': result['prediction'],
             'is_real': result['is_real'],
             'confidence': result['confidence'],
+            'stage': result['stage'],
             'text_preview': result['text']
         }
         
@@ -113,7 +143,8 @@ def batch_predict():
                 {
                     'prediction': r['prediction'],
                     'is_real': r['is_real'],
-                    'confidence': r['confidence']
+                    'confidence': r['confidence'],
+                    'stage': r['stage']
                 }
                 for r in results
             ],
@@ -128,6 +159,219 @@ def batch_predict():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@app.route('/api/features', methods=['GET'])
+def features():
+    """
+    Publish the feature contract of the loaded model.
+    
+    Returns the tokenization settings, the feature space fingerprint and
+    the term -> id vocabulary clients need to send pre-featurized vectors
+    to /api/predict/features.
+    
+    Query parameters:
+        vocabulary: Set to "false" to omit the (large) vocabulary
+    """
+    try:
+        include_vocabulary = request.args.get('vocabulary', 'true').lower() != 'false'
+        
+        # The body is serialized once and revalidated through its ETag
+        body, etag = predictor.get_count_scorer().contract_body(include_vocabulary)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    except Exception as e:
+        logging.error(f"Error building feature contract: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/predict/features', methods=['POST'])
+def predict_features():
+    """
+    Predict on pre-featurized term-count vectors, skipping tokenization.
+    
+    Expected JSON:
+    {
+        "feature_space": "fingerprint from /api/features",
+        "vectors": [{"term_ids": [12, 845], "counts": [3, 1]}, ...]
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or 'vectors' not in data:
+            return jsonify({'error': 'Missing "vectors" in request body'}), 400
+        
+        vectors = data['vectors']
+        
+        if not isinstance(vectors, list) or not vectors:
+            return jsonify({'error': '"vectors" must be a non-empty list'}), 400
+        
+        if len(vectors) > 1000:
+            return jsonify({'error': 'Maximum 1000 vectors per request'}), 400
+        
+        # Reject vectors built against another model's vocabulary
+        if 'feature_space' not in data:
+            return jsonify({'error': 'Missing "feature_space" in request body'}), 400
+        
+        if data['feature_space'] != predictor.get_count_scorer().feature_space:
+            return jsonify({'error': 'Feature space does not match the loaded model'}), 409
+        
+        try:
+            results = predictor.predict_counts(vectors)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        response = {
+            'predictions': results,
+            'count': len(results)
+        }
+        
+        logging.info(f"Pre-featurized prediction made for {len(results)} vectors")
+        return jsonify(response), 200
+        
+    except Exception as e:
+        logging.error(f"Error during pre-featurized prediction: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def _iter_stream_lines(stream, max_bytes):
+    """
+    Yield (line, too_long) for each line of a request stream.
+    
+    At most max_bytes of a line are held in memory; the rest of an
+    oversized line is read and discarded in bounded pieces.
+    """
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        
+        if len(line) <= max_bytes or line.endswith(b"\n"):
+            yield line, False
+            continue
+        
+        # Skip the rest of the oversized line
+        while line and not line.endswith(b"\n"):
+            line = stream.readline(max_bytes)
+        yield b"", True
+
+
+def _score_stream_chunk(chunk):
+    """Score a chunk of (index, id, text) entries and yield NDJSON lines."""
+    results = predictor.predict_batch([text for _, _, text in chunk])
+    for (index, item_id, _), r in zip(chunk, results):
+        line = {
+            'index': index,
+            'prediction': r['prediction'],
+            'is_real': r['is_real'],
+            'confidence': r['confidence'],
+            'stage': r['stage']
+        }
+        if item_id is not None:
+            line['id'] = item_id
+        yield json.dumps(line) + "\n"
+
+
+@app.route('/api/batch-predict/stream', methods=['POST'])
+def batch_predict_stream():
+    """
+    Stream predictions for newline-delimited JSON articles.
+    
+    The request body is read line by line (chunked uploads are supported),
+    texts are scored in chunks of STREAM_CHUNK_SIZE and one NDJSON result
+    line is streamed back per article as soon as its chunk is scored.
+    Results and in-band errors are emitted in input order; lines longer
+    than STREAM_MAX_LINE_BYTES are rejected with an error line.
+    
+    Expected NDJSON, one article per line:
+    {"id": "optional-id", "text": "article text here"}
+    """
+    def generate():
+        chunk = []
+        count = 0
+        try:
+            lines = _iter_stream_lines(request.stream, STREAM_MAX_LINE_BYTES)
+            for index, (raw_line, too_long) in enumerate(lines):
+                raw_line = raw_line.strip()
+                if not raw_line and not too_long:
+                    continue
+                
+                error = None
+                if too_long:
+                    error = f'Line exceeds {STREAM_MAX_LINE_BYTES} bytes'
+                else:
+                    try:
+                        item = json.loads(raw_line)
+                        text = item['text'].strip()
+                        if not text:
+                            raise ValueError('Text cannot be empty')
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        error = 'Each line must be a JSON object with a non-empty "text"'
+                
+                if error is not None:
+                    # Flush pending results first so the output keeps input order
+                    if chunk:
+                        yield from _score_stream_chunk(chunk)
+                        count += len(chunk)
+                        chunk = []
+                    yield json.dumps({'index': index, 'error': error}) + "\n"
+                    continue
+                
+                chunk.append((index, item.get('id'), text))
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    yield from _score_stream_chunk(chunk)
+                    count += len(chunk)
+                    chunk = []
+            
+            if chunk:
+                yield from _score_stream_chunk(chunk)
+                count += len(chunk)
+            
+            logging.info(f"Streaming batch prediction made for {count} texts")
+            
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logging.error(f"Error during streaming batch prediction: {str(e)}")
+            yield json.dumps({'error': 'Internal server error'}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/debug/profile', methods=['GET'])
+def debug_profile():
+    """
+    Sample the stacks of all request threads for a time window.
+    
+    Only available when ENABLE_PROFILER and PROFILER_TOKEN are set, and the
+    token must be sent in the X-Profiler-Token header. Returns collapsed
+    stacks ("frame;frame;frame count" per line) ready for a flame graph tool.
+    
+    Query parameters:
+        seconds: Sampling window, up to PROFILER_MAX_SECONDS (default 10)
+    """
+    if not PROFILER_ENABLED:
+        return jsonify({'error': 'Endpoint not found'}), 404
+    
+    token = request.headers.get('X-Profiler-Token', '')
+    if not hmac.compare_digest(token.encode(), PROFILER_TOKEN.encode()):
+        return jsonify({'error': 'Invalid profiler token'}), 403
+    
+    try:
+        seconds = float(request.args.get('seconds', 10))
+    except ValueError:
+        seconds = None
+    if seconds is None or not 0 < seconds <= PROFILER_MAX_SECONDS:
+        return jsonify({'error': f'"seconds" must be a number between 0 and {PROFILER_MAX_SECONDS}'}), 400
+    
+    logging.info(f"Profiling request threads for {seconds}s")
+    stacks = sample_stacks(seconds)
+    
+    if stacks is None:
+        return jsonify({'error': 'A profile is already running'}), 409
+    
+    return Response(format_collapsed(stacks), mimetype='text/plain')
+
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -148,6 +392,11 @@ if __name__ == '__main__':
     print("  GET  /api/health          - Health check")
     print("  POST /api/predict         - Single prediction")
     print("  POST /api/batch-predict   - Batch predictions")
+    print("  POST /api/batch-predict/stream - Streaming NDJSON predictions")
+    print("  GET  /api/features        - Feature vocabulary and tokenization contract")
+    print("  POST /api/predict/features - Predictions on pre-featurized term counts")
+    if PROFILER_ENABLED:
+        print("  GET  /api/debug/profile   - Sampling profiler (collapsed stacks)")
     print("\n" + "="*60)
     
     # Get port from environment variable (for cloud deployment) or default to 5000
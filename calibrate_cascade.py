@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.cascade import calibrate_cascade, cascade_decision_scores, save_cascade_config
+from src.logger import logging
+from src.model_serialization import load_model
+from train_model import load_dataset, split_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate early-exit cascade scoring on the test split")
+    parser.add_argument("--model-path", default="models/fake_news_model.pkl")
+    parser.add_argument("--output-path", default="models/cascade.json")
+    parser.add_argument("--prefix-tokens", type=int, default=100,
+                        help="Number of leading tokens (title included) scored in the first stage")
+    parser.add_argument("--target-agreement", type=float, default=0.999,
+                        help="Required agreement rate with full-text scoring")
+    args = parser.parse_args()
+
+    if args.prefix_tokens <= 0:
+        parser.error("--prefix-tokens must be positive")
+    if not 0 < args.target_agreement <= 1:
+        parser.error("--target-agreement must be in (0, 1]")
+
+    model = load_model(args.model_path)
+
+    X, y = load_dataset()
+    _, X_test, _, _ = split_dataset(X, y)
+    X_test = list(X_test)
+
+    logging.info(f"Calibrating cascade (prefix_tokens={args.prefix_tokens}, "
+                 f"target_agreement={args.target_agreement})...")
+    config = calibrate_cascade(model, X_test, args.prefix_tokens, args.target_agreement)
+
+    if config['threshold'] is None:
+        print(f"\nNo prefix of {args.prefix_tokens} tokens can exit early at "
+              f"{args.target_agreement} agreement, no cascade config saved.")
+        logging.info(f"Cascade calibration found no early exit: {config}")
+        return
+
+    config_path = save_cascade_config(config, args.output_path)
+
+    # Compare single-article latency of full and cascaded scoring
+    start = time.perf_counter()
+    for text in X_test:
+        model.decision_function([text])
+    full_ms = (time.perf_counter() - start) / len(X_test) * 1000
+
+    start = time.perf_counter()
+    for text in X_test:
+        cascade_decision_scores(model, [text], config['prefix_tokens'], config['threshold'])
+    cascade_ms = (time.perf_counter() - start) / len(X_test) * 1000
+
+    print(f"\n{'='*50}")
+    print(f"Threshold: {config['threshold']:.4f}")
+    print(f"Agreement with full scoring: {config['agreement']:.4f}")
+    print(f"Early exit rate: {config['early_exit_rate']:.1%}")
+    print(f"Latency: {full_ms:.2f} ms full, {cascade_ms:.2f} ms cascade")
+    print(f"Config saved at: {config_path}")
+    print(f"{'='*50}")
+
+    logging.info(f"Cascade calibrated: {config}")
+
+
+if __name__ == "__main__":
+    main()
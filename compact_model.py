@@ -0,0 +1,137 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from sklearn.metrics import accuracy_score
+
+# Add src to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.logger import logging
+from src.model_compaction import SUPPORTED_DTYPES, compact_pipeline
+from src.model_serialization import load_model, save_model
+from train_model import load_dataset, split_dataset
+
+
+# Loads a model in a fresh interpreter and prints the peak RSS growth in KB
+RSS_PROBE = """
+import pickle, resource, sys
+sys.path.insert(0, sys.argv[2])
+import sklearn.pipeline, sklearn.svm, sklearn.feature_extraction.text
+import src.model_compaction
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+with open(sys.argv[1], 'rb') as f:
+    model = pickle.load(f)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+
+
+def measure_load_rss(model_path):
+    """
+    Measure how much resident memory loading a model adds to a fresh process.
+
+    Args:
+        model_path: Path to the pickled model
+
+    Returns:
+        float: RSS growth in MB, or None if it cannot be measured on this platform
+    """
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", RSS_PROBE, model_path, os.path.dirname(os.path.abspath(__file__))],
+            capture_output=True, text=True, check=True
+        ).stdout
+        return int(output.strip()) / 1024
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def measure_latency(model, texts):
+    """
+    Measure the mean single-article prediction latency.
+
+    Args:
+        model: Model exposing predict and decision_function
+        texts: List of article texts
+
+    Returns:
+        float: Mean latency per article in milliseconds
+    """
+    start = time.perf_counter()
+    for text in texts:
+        model.predict([text])
+        model.decision_function([text])
+    return (time.perf_counter() - start) / len(texts) * 1000
+
+
+def evaluate(name, model, model_path, X_test, y_test, latency_samples):
+    """
+    Collect size, load RSS, latency and accuracy for one saved model.
+
+    Args:
+        name: Label used in the report
+        model: Loaded model exposing predict and decision_function
+        model_path: Path to the pickled model
+        X_test: Test split texts
+        y_test: Test split labels
+        latency_samples: Number of texts used to measure latency
+
+    Returns:
+        dict: Report row for the model
+    """
+    return {
+        'name': name,
+        'size_mb': os.path.getsize(model_path) / (1024 * 1024),
+        'rss_mb': measure_load_rss(model_path),
+        'latency_ms': measure_latency(model, X_test[:latency_samples]),
+        'accuracy': accuracy_score(y_test, model.predict(X_test))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune and quantize the trained fake news model")
+    parser.add_argument("--model-path", default="models/fake_news_model.pkl")
+    parser.add_argument("--output-name", default="fake_news_model_compact.pkl")
+    parser.add_argument("--threshold", type=float, default=0.01,
+                        help="Drop features whose absolute coefficient is below this value")
+    parser.add_argument("--dtype", choices=SUPPORTED_DTYPES, default="float16")
+    parser.add_argument("--latency-samples", type=int, default=500)
+    args = parser.parse_args()
+
+    pipeline = load_model(args.model_path)
+
+    X, y = load_dataset()
+    _, X_test, _, y_test = split_dataset(X, y)
+    X_test, y_test = list(X_test), list(y_test)
+
+    logging.info(f"Compacting model (threshold={args.threshold}, dtype={args.dtype})...")
+    compact = compact_pipeline(pipeline, threshold=args.threshold, dtype=args.dtype)
+    compact_path = save_model(compact, args.output_name)
+
+    n_features = len(pipeline.named_steps['classifier'].coef_[0])
+    print(f"\nFeatures kept: {compact.n_features}/{n_features} "
+          f"({compact.n_features / n_features:.1%})")
+
+    rows = [
+        evaluate("original", pipeline, args.model_path, X_test, y_test, args.latency_samples),
+        evaluate("compact", compact, compact_path, X_test, y_test, args.latency_samples)
+    ]
+
+    print(f"\n{'='*70}")
+    print(f"{'Model':<10} {'Size (MB)':>10} {'RSS (MB)':>10} {'Latency (ms)':>13} {'Accuracy':>10}")
+    print(f"{'-'*70}")
+    for row in rows:
+        rss = f"{row['rss_mb']:.1f}" if row['rss_mb'] is not None else "n/a"
+        print(f"{row['name']:<10} {row['size_mb']:>10.1f} {rss:>10} "
+              f"{row['latency_ms']:>13.2f} {row['accuracy']:>10.4f}")
+    print(f"{'='*70}")
+    print(f"Accuracy loss: {rows[0]['accuracy'] - rows[1]['accuracy']:.4f}")
+
+    logging.info(f"Compact model accuracy: {rows[1]['accuracy']:.4f} "
+                 f"(original {rows[0]['accuracy']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
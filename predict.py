@@ -5,7 +5,10 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.model_serialization import load_model
+from src.cascade import cascade_decision_scores, load_cascade_config
 from src.logger import logging
+from src.multi_model import MultiModelScorer, ShadowMonitor
+from src.featurized import CountScorer
 
 
 class FakeNewsPredictor:
@@ -13,20 +16,102 @@ class FakeNewsPredictor:
     Wrapper class for making predictions on news articles.
     """
     
-    def __init__(self, model_path="models/fake_news_model.pkl"):
+    def __init__(self, model_path="models/fake_news_model.pkl", cascade_path=None, shadow_model_path=None):
         """
         Initialize the predictor with a trained model.
         
         Args:
             model_path: Path to the saved model pickle file
+            cascade_path: Optional cascade config written by calibrate_cascade.py.
+                When set, articles are first scored on their leading tokens and
+                only rescored in full when the margin is not confident enough.
+            shadow_model_path: Optional candidate model scored in the background
+                next to the primary model, sharing its vectorization when the
+                feature spaces match. Agreement is logged but never served.
+                With a cascade, agreement is reported separately for articles
+                the primary scored in full and for prefix-decided articles.
         """
         try:
             self.model = load_model(model_path)
+            self.cascade = load_cascade_config(cascade_path) if cascade_path else None
+            
+            self.count_scorer = None
+            self.scorer = None
+            self.shadow = None
+            if shadow_model_path:
+                self.scorer = MultiModelScorer({
+                    'primary': self.model,
+                    'shadow': load_model(shadow_model_path)
+                })
+                self.shadow = ShadowMonitor(self.scorer)
             logging.info("✓ Predictor initialized successfully")
         except FileNotFoundError as e:
             logging.error(f"Model not found: {e}")
             raise
     
+    def _build_result(self, text, prediction, decision_score, stage="full"):
+        """
+        Format a single prediction as a result dict.
+        """
+        return {
+            'text': text[:100] + "..." if len(text) > 100 else text,
+            'prediction': prediction,
+            'is_real': prediction == 'real',
+            'confidence': abs(decision_score) if decision_score is not None else None,
+            'stage': stage
+        }
+    
+    def _decision_scores(self, texts):
+        """
+        Compute decision scores, going through the cascade when configured,
+        and hand them to the shadow monitor when one is running.
+        
+        Returns:
+            tuple: (decision_scores, stages)
+        """
+        if self.shadow is None:
+            if self.cascade is None:
+                return self.model.decision_function(texts), ["full"] * len(texts)
+            return cascade_decision_scores(
+                self.model, texts,
+                prefix_tokens=self.cascade['prefix_tokens'],
+                threshold=self.cascade['threshold']
+            )
+        
+        # Texts scored on their full text are compared with the shadow using
+        # the primary features; prefix-decided texts are queued separately
+        # and scored in full by the shadow thread, off the request path
+        full_pass = {}
+        
+        def full_decision_function(full_texts):
+            features = self.scorer.vectorize(full_texts, ['primary'])
+            full_scores = self.scorer.score(features, ['primary'])['primary']
+            full_pass.update(texts=full_texts, features=features, scores=full_scores)
+            return full_scores
+        
+        if self.cascade is None:
+            decision_scores = full_decision_function(texts)
+            stages = ["full"] * len(texts)
+        else:
+            decision_scores, stages = cascade_decision_scores(
+                self.model, texts,
+                prefix_tokens=self.cascade['prefix_tokens'],
+                threshold=self.cascade['threshold'],
+                full_decision_function=full_decision_function
+            )
+        
+        if full_pass:
+            self.shadow.submit(full_pass['texts'], full_pass['features'], full_pass['scores'])
+        
+        prefix_decided = [i for i, stage in enumerate(stages) if stage == "prefix"]
+        if prefix_decided:
+            self.shadow.submit(
+                [texts[i] for i in prefix_decided], {},
+                [decision_scores[i] for i in prefix_decided], stage="prefix"
+            )
+        
+        return decision_scores, stages
+    
     def predict(self, text):
         """
         Predict if the given text is real or fake news.
@@ -38,21 +123,21 @@ class FakeNewsPredictor:
             dict: Prediction result with label and confidence info
         """
         try:
-            prediction = self.model.predict([text])[0]
+            if self.cascade is not None or self.shadow is not None:
+                decision_scores, stages = self._decision_scores([text])
+                decision_score, stage = decision_scores[0], stages[0]
+                prediction = self.model.classes_[int(decision_score > 0)]
+            else:
+                prediction = self.model.predict([text])[0]
+                stage = "full"
+                
+                # Get decision function score for confidence
+                try:
+                    decision_score = self.model.decision_function([text])[0]
+                except:
+                    decision_score = None
             
-            # Get decision function score for confidence
-            try:
-                decision_score = self.model.decision_function([text])[0]
-                confidence = abs(decision_score)
-            except:
-                confidence = None
-            
-            result = {
-                'text': text[:100] + "..." if len(text) > 100 else text,
-                'prediction': prediction,
-                'is_real': prediction == 'real',
-                'confidence': confidence
-            }
+            result = self._build_result(text, prediction, decision_score, stage)
             
             logging.info(f"Prediction made: {prediction}")
             return result
@@ -61,20 +146,71 @@ class FakeNewsPredictor:
             logging.error(f"Error during prediction: {str(e)}")
             raise
     
+    def get_count_scorer(self):
+        """
+        Return the scorer for pre-featurized term counts, built on first use.
+        """
+        if self.count_scorer is None:
+            self.count_scorer = CountScorer(self.model)
+        return self.count_scorer
+    
+    def predict_counts(self, vectors):
+        """
+        Make predictions on pre-featurized term-count vectors.
+        
+        The counts skip tokenization and go straight into the IDF weighting
+        and classifier stages of the model.
+        
+        Args:
+            vectors: List of dicts with "term_ids" and "counts" lists, using the
+                vocabulary published by get_count_scorer().contract()
+        
+        Returns:
+            list: List of prediction results
+        """
+        count_scorer = self.get_count_scorer()
+        decision_scores = count_scorer.decision_function(count_scorer.counts_matrix(vectors))
+        predictions = self.model.classes_[(decision_scores > 0).astype(int)]
+        
+        return [
+            {
+                'prediction': prediction,
+                'is_real': prediction == 'real',
+                'confidence': abs(decision_score)
+            }
+            for prediction, decision_score in zip(predictions, decision_scores)
+        ]
+    
     def predict_batch(self, texts):
         """
         Make predictions on multiple texts.
         
+        The texts are vectorized and scored together in a single pass
+        rather than one model call per text.
+        
         Args:
             texts: List of text strings
         
         Returns:
             list: List of prediction results
         """
-        results = []
-        for text in texts:
-            results.append(self.predict(text))
-        return results
+        if not texts:
+            return []
+        
+        try:
+            # A positive decision score maps to the second class, so the
+            # labels can be derived without vectorizing the texts twice
+            decision_scores, stages = self._decision_scores(texts)
+            predictions = self.model.classes_[(decision_scores > 0).astype(int)]
+            
+            return [
+                self._build_result(text, prediction, decision_score, stage)
+                for text, prediction, decision_score, stage in zip(texts, predictions, decision_scores, stages)
+            ]
+            
+        except Exception as e:
+            logging.error(f"Error during batch prediction: {str(e)}")
+            raise
 
 
 if __name__ == "__main__":
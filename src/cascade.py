@@ -0,0 +1,138 @@
+import json
+import os
+
+import numpy as np
+
+
+def truncate_tokens(text, n_tokens):
+    """
+    Keep only the first n whitespace-separated tokens of a text.
+
+    Articles are scored as "title text", so the prefix always includes
+    the title.
+    """
+    return " ".join(text.split(maxsplit=n_tokens)[:n_tokens])
+
+
+def long_text_mask(texts, prefix_tokens):
+    """
+    Flag texts with more than prefix_tokens tokens. Shorter texts fit in the
+    prefix, so they go straight to the full-text stage.
+    """
+    return np.array([len(text.split(maxsplit=prefix_tokens)) > prefix_tokens for text in texts], dtype=bool)
+
+
+def cascade_decision_scores(model, texts, prefix_tokens, threshold, full_decision_function=None):
+    """
+    Score texts on their prefix first and only rescore the full text when
+    the prefix margin is not confident enough.
+
+    Args:
+        model: Model exposing decision_function
+        texts: List of article texts
+        prefix_tokens: Number of leading tokens scored in the first stage
+        threshold: Minimum |decision score| for the prefix to decide, or None
+            when no prefix is confident enough and every text is scored in full
+        full_decision_function: Optional function used for the full-text stage
+            instead of model.decision_function (e.g. to keep the features)
+
+    Returns:
+        tuple: (decision_scores, stages) where each stage is "prefix" or "full"
+    """
+    full_decision_function = full_decision_function or model.decision_function
+    scores = np.zeros(len(texts), dtype=np.float64)
+    stages = np.full(len(texts), "full", dtype=object)
+
+    # Texts that fit in the prefix go straight to the full-text stage
+    if threshold is not None:
+        long_texts = np.flatnonzero(long_text_mask(texts, prefix_tokens))
+
+        if len(long_texts):
+            prefix_scores = np.asarray(
+                model.decision_function([truncate_tokens(texts[i], prefix_tokens) for i in long_texts]),
+                dtype=np.float64
+            )
+            confident = np.abs(prefix_scores) >= threshold
+            scores[long_texts[confident]] = prefix_scores[confident]
+            stages[long_texts[confident]] = "prefix"
+
+    remaining = np.flatnonzero(stages == "full")
+    if len(remaining):
+        scores[remaining] = full_decision_function([texts[i] for i in remaining])
+
+    return scores, list(stages)
+
+
+def calibrate_cascade(model, texts, prefix_tokens=100, target_agreement=0.999):
+    """
+    Find the smallest prefix margin threshold that keeps the cascade's
+    agreement with full-text scoring at or above the target.
+
+    Args:
+        model: Model exposing decision_function
+        texts: List of calibration article texts (e.g. the test split)
+        prefix_tokens: Number of leading tokens scored in the first stage
+        target_agreement: Required fraction of predictions matching full scoring
+
+    Returns:
+        dict: Cascade configuration and its measured agreement and early exit
+        rate. The threshold is None when no prefix can exit early.
+
+    Raises:
+        ValueError: If prefix_tokens is not positive or target_agreement is not in (0, 1]
+    """
+    if prefix_tokens <= 0:
+        raise ValueError("prefix_tokens must be positive")
+    if not 0 < target_agreement <= 1:
+        raise ValueError("target_agreement must be in (0, 1]")
+
+    # Only texts longer than the prefix can exit early, as in
+    # cascade_decision_scores
+    long_texts = [texts[i] for i in np.flatnonzero(long_text_mask(texts, prefix_tokens))]
+
+    if long_texts:
+        prefix_scores = np.asarray(model.decision_function([truncate_tokens(t, prefix_tokens) for t in long_texts]))
+        full_scores = np.asarray(model.decision_function(long_texts))
+    else:
+        prefix_scores = full_scores = np.zeros(0)
+
+    # Exit early on the most confident prefixes first, as long as the
+    # number of disagreements over all texts stays within the budget
+    order = np.argsort(-np.abs(prefix_scores))
+    disagreements = np.cumsum((prefix_scores[order] > 0) != (full_scores[order] > 0))
+    budget = (1 - target_agreement) * len(texts)
+    n_early = int(np.searchsorted(disagreements, budget, side='right'))
+
+    if n_early == 0:
+        threshold = None
+        agreement = 1.0
+        early_exit_rate = 0.0
+    else:
+        threshold = float(np.abs(prefix_scores[order[n_early - 1]]))
+        early = np.abs(prefix_scores) >= threshold
+        disagree = early & ((prefix_scores > 0) != (full_scores > 0))
+        agreement = 1 - disagree.sum() / len(texts)
+        early_exit_rate = early.sum() / len(texts)
+
+    return {
+        'prefix_tokens': prefix_tokens,
+        'threshold': threshold,
+        'target_agreement': target_agreement,
+        'agreement': float(agreement),
+        'early_exit_rate': float(early_exit_rate)
+    }
+
+
+def save_cascade_config(config, config_path="models/cascade.json"):
+    os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2, allow_nan=False)
+    return config_path
+
+
+def load_cascade_config(config_path="models/cascade.json"):
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Cascade config not found at: {config_path}")
+
+    with open(config_path) as f:
+        return json.load(f)
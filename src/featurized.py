@@ -0,0 +1,145 @@
+import hashlib
+import json
+
+import numpy as np
+from scipy import sparse
+
+from src.model_compaction import CompactTextClassifier, weight_counts
+from src.multi_model import feature_space_key
+
+
+# Vectorizer parameters a client needs to reproduce the term counts
+TOKENIZATION_PARAMS = (
+    'analyzer', 'lowercase', 'strip_accents', 'token_pattern',
+    'ngram_range', 'stop_words', 'binary'
+)
+
+
+class CountScorer:
+    """
+    Score raw term-count vectors with a trained model, skipping tokenization.
+
+    Counts go straight into the model's IDF weighting, normalization and
+    classifier stages. Supports the TF-IDF + LinearSVC pipeline and the
+    compacted model.
+    """
+
+    def __init__(self, model):
+        if isinstance(model, CompactTextClassifier):
+            self.vectorizer = model.vectorizer
+            self._weight_counts = model.weight_counts
+            self._decision_function = model.decision_function_from_features
+        else:
+            self.vectorizer = model.named_steps['preprocessor']
+            self._idf = self.vectorizer.idf_ if self.vectorizer.use_idf else None
+            self._weight_counts = self._weight_tfidf_counts
+            self._decision_function = model.named_steps['classifier'].decision_function
+
+        self.n_features = len(self.vectorizer.vocabulary_)
+        self.feature_space = feature_space_key(self.vectorizer)
+        self._contract_bodies = {}
+
+    def _weight_tfidf_counts(self, counts):
+        return weight_counts(
+            counts, self._idf,
+            sublinear_tf=self.vectorizer.sublinear_tf,
+            norm=self.vectorizer.norm
+        )
+
+    def contract(self, include_vocabulary=True):
+        """
+        Describe the tokenization and feature space clients must reproduce.
+
+        Args:
+            include_vocabulary: Whether to include the term -> id mapping
+
+        Returns:
+            dict: JSON-serializable feature contract
+        """
+        params = self.vectorizer.get_params()
+        contract = {
+            'feature_space': self.feature_space,
+            'n_features': self.n_features,
+            'tokenization': {
+                key: list(params[key]) if isinstance(params[key], (tuple, frozenset, set)) else params[key]
+                for key in TOKENIZATION_PARAMS
+            },
+            # Custom callables cannot be reproduced from the contract
+            'custom_preprocessing': params['preprocessor'] is not None or params['tokenizer'] is not None,
+            'ngram_separator': ' '
+        }
+        if include_vocabulary:
+            contract['vocabulary'] = {term: int(index) for term, index in self.vectorizer.vocabulary_.items()}
+
+        return contract
+
+    def contract_body(self, include_vocabulary=True):
+        """
+        Serialized feature contract, built once and cached as bytes.
+
+        Only the JSON body is kept, not a second copy of the vocabulary
+        as a dict.
+
+        Returns:
+            tuple: (body, etag)
+        """
+        if include_vocabulary not in self._contract_bodies:
+            body = json.dumps(self.contract(include_vocabulary), separators=(',', ':')).encode()
+            etag = hashlib.sha1(body).hexdigest()
+            self._contract_bodies[include_vocabulary] = (body, etag)
+        return self._contract_bodies[include_vocabulary]
+
+    def counts_matrix(self, vectors):
+        """
+        Build a sparse count matrix from term id / count vectors.
+
+        Args:
+            vectors: List of dicts with "term_ids" and "counts" lists
+
+        Returns:
+            scipy.sparse.csr_matrix: Count matrix of shape (len(vectors), n_features)
+
+        Raises:
+            ValueError: If a vector is malformed or references unknown terms
+        """
+        indptr = [0]
+        indices = []
+        data = []
+
+        for vector in vectors:
+            try:
+                term_ids = np.asarray(vector['term_ids'])
+                counts = np.asarray(vector['counts'], dtype=np.float64)
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Each vector must have numeric "term_ids" and "counts" lists')
+
+            # Reject floats (and bools) instead of silently truncating them
+            if term_ids.size and term_ids.dtype.kind not in 'iu':
+                raise ValueError('Term ids must be integers')
+            term_ids = term_ids.astype(np.int64)
+
+            if term_ids.ndim != 1 or term_ids.shape != counts.shape:
+                raise ValueError('"term_ids" and "counts" must be lists of the same length')
+            if len(term_ids) and (term_ids.min() < 0 or term_ids.max() >= self.n_features):
+                raise ValueError(f'Term ids must be between 0 and {self.n_features - 1}')
+            if np.any(counts < 0) or not np.all(np.isfinite(counts)):
+                raise ValueError('Counts must be finite and non-negative')
+
+            indices.append(term_ids)
+            data.append(counts)
+            indptr.append(indptr[-1] + len(term_ids))
+
+        X = sparse.csr_matrix(
+            (np.concatenate(data) if data else [], np.concatenate(indices) if indices else [], indptr),
+            shape=(len(vectors), self.n_features),
+            dtype=np.float64
+        )
+        # Merge repeated term ids the same way the vectorizer would count them
+        X.sum_duplicates()
+        X.eliminate_zeros()
+        if self.vectorizer.binary:
+            X.data.fill(1)
+        return X
+
+    def decision_function(self, counts):
+        return self._decision_function(self._weight_counts(counts))
@@ -0,0 +1,178 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+
+SUPPORTED_DTYPES = ("float16", "int8")
+
+
+def quantize(values, dtype="float16"):
+    """
+    Quantize a float array to a compact dtype.
+
+    Args:
+        values: Array of float values
+        dtype: Target storage type, "float16" or "int8"
+
+    Returns:
+        tuple: (quantized_values, scale) where values ~= quantized_values * scale
+    """
+    values = np.asarray(values, dtype=np.float64)
+
+    if dtype == "float16":
+        return values.astype(np.float16), 1.0
+
+    if dtype == "int8":
+        max_abs = float(np.abs(values).max()) if values.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        return np.round(values / scale).astype(np.int8), scale
+
+    raise ValueError(f"Unsupported dtype: {dtype} (expected one of {SUPPORTED_DTYPES})")
+
+
+def weight_counts(counts, idf, idf_scale=1.0, sublinear_tf=False, norm="l2"):
+    """
+    Apply TF-IDF weighting and normalization to raw term counts.
+
+    Only the weights of non-zero features are gathered, so quantized IDF
+    arrays are never expanded to full float64 copies.
+
+    Args:
+        counts: Sparse matrix of term counts
+        idf: IDF weight per feature (possibly quantized), or None to skip IDF
+        idf_scale: Scale factor applied to the stored IDF weights
+        sublinear_tf: Whether to replace tf with 1 + log(tf)
+        norm: Row normalization ("l1", "l2") or None
+
+    Returns:
+        scipy.sparse.csr_matrix: Weighted feature matrix
+    """
+    X = sparse.csr_matrix(counts, dtype=np.float64, copy=True)
+
+    if sublinear_tf:
+        np.log(X.data, X.data)
+        X.data += 1
+
+    if idf is not None:
+        X.data *= idf[X.indices].astype(np.float64) * idf_scale
+
+    if norm:
+        X = normalize(X, norm=norm, copy=False)
+
+    return X
+
+
+class CompactTextClassifier:
+    """
+    Pruned and quantized replacement for the TF-IDF + LinearSVC pipeline.
+
+    Exposes the same predict/decision_function interface as the sklearn
+    pipeline so it can be loaded by FakeNewsPredictor unchanged.
+    """
+
+    def __init__(self, vectorizer, idf, idf_scale, coef, coef_scale,
+                 intercept, classes, sublinear_tf=False, norm="l2"):
+        self.vectorizer = vectorizer
+        self.idf = idf
+        self.idf_scale = idf_scale
+        self.coef = coef
+        self.coef_scale = coef_scale
+        self.intercept = intercept
+        self.classes_ = classes
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+    @property
+    def n_features(self):
+        return len(self.coef)
+
+    def weight_counts(self, counts):
+        """
+        Apply TF-IDF weighting and normalization to raw term counts.
+
+        Args:
+            counts: Sparse matrix of term counts over the compact vocabulary
+
+        Returns:
+            scipy.sparse.csr_matrix: Weighted feature matrix
+        """
+        return weight_counts(counts, self.idf, self.idf_scale, self.sublinear_tf, self.norm)
+
+    def transform(self, raw_documents):
+        return self.weight_counts(self.vectorizer.transform(raw_documents))
+
+    def decision_function_from_features(self, X):
+        weights = self.coef[X.indices].astype(np.float64) * self.coef_scale
+        contributions = sparse.csr_matrix((X.data * weights, X.indices, X.indptr), shape=X.shape)
+        return np.asarray(contributions.sum(axis=1)).ravel() + self.intercept
+
+    def decision_function(self, raw_documents):
+        return self.decision_function_from_features(self.transform(raw_documents))
+
+    def predict(self, raw_documents):
+        scores = self.decision_function(raw_documents)
+        return self.classes_[(scores > 0).astype(int)]
+
+
+def compact_pipeline(pipeline, threshold=0.01, dtype="float16"):
+    """
+    Build a pruned and quantized copy of a trained TF-IDF + LinearSVC pipeline.
+
+    Features whose absolute coefficient is below the threshold are dropped
+    from the vocabulary, and the remaining IDF weights and coefficients are
+    stored in the requested compact dtype.
+
+    Note that L2 normalization then runs over the pruned vocabulary only, so
+    the scores of kept features shift as well. Together with quantization
+    this is the main source of accuracy loss.
+
+    Args:
+        pipeline: Trained sklearn pipeline with 'preprocessor' and 'classifier' steps
+        threshold: Minimum absolute coefficient for a feature to be kept
+        dtype: Storage type for IDF weights and coefficients, "float16" or "int8"
+
+    Returns:
+        CompactTextClassifier: The compacted model
+    """
+    tfidf = pipeline.named_steps['preprocessor']
+    classifier = pipeline.named_steps['classifier']
+
+    if classifier.coef_.shape[0] != 1:
+        raise ValueError("Model compaction only supports binary classifiers")
+
+    coef = classifier.coef_[0]
+    kept = np.flatnonzero(np.abs(coef) >= threshold)
+
+    if len(kept) == 0:
+        raise ValueError(f"No features have an absolute coefficient above {threshold}")
+
+    feature_names = tfidf.get_feature_names_out()
+
+    # Rebuild a plain count vectorizer with the same tokenization settings,
+    # but only the surviving terms and without the fitted stop_words_ set
+    count_params = CountVectorizer().get_params().keys()
+    vectorizer = CountVectorizer(**{
+        key: value for key, value in tfidf.get_params().items() if key in count_params
+    })
+    vectorizer.vocabulary_ = {feature_names[old]: new for new, old in enumerate(kept)}
+    vectorizer.fixed_vocabulary_ = True
+
+    if tfidf.use_idf:
+        idf, idf_scale = quantize(tfidf.idf_[kept], dtype)
+    else:
+        idf, idf_scale = None, 1.0
+
+    coef, coef_scale = quantize(coef[kept], dtype)
+
+    return CompactTextClassifier(
+        vectorizer=vectorizer,
+        idf=idf,
+        idf_scale=idf_scale,
+        coef=coef,
+        coef_scale=coef_scale,
+        intercept=float(classifier.intercept_[0]),
+        classes=classifier.classes_,
+        sublinear_tf=tfidf.sublinear_tf,
+        norm=tfidf.norm
+    )
@@ -0,0 +1,201 @@
+import hashlib
+import queue
+import threading
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+from src.logger import logging
+
+
+def feature_space_key(vectorizer):
+    """
+    Fingerprint a fitted vectorizer's configuration and feature space.
+
+    Two vectorizers with the same key produce identical feature matrices,
+    so texts only need to be vectorized once for both.
+    """
+    digest = hashlib.sha1()
+    digest.update(type(vectorizer).__name__.encode())
+    digest.update(repr(sorted(vectorizer.get_params().items())).encode())
+    digest.update("\n".join(vectorizer.get_feature_names_out()).encode())
+    if getattr(vectorizer, 'use_idf', False):
+        digest.update(np.ascontiguousarray(vectorizer.idf_).tobytes())
+    return digest.hexdigest()
+
+
+class MultiModelScorer:
+    """
+    Score texts with several models, vectorizing them once per shared
+    feature space.
+
+    Two-step pipelines (vectorizer + classifier) whose vectorizers share the
+    same configuration and vocabulary are grouped, and the sparse matrix is
+    passed to every classifier of the group. Any other model is scored on
+    its own through its decision_function.
+
+    All models must be binary with the same classes_ order, so that their
+    decision scores share the same sign convention.
+    """
+
+    def __init__(self, models):
+        """
+        Args:
+            models: Dict mapping model names to trained models
+
+        Raises:
+            ValueError: If the models are not binary or disagree on classes_
+        """
+        classes = None
+        for name, model in models.items():
+            if len(model.classes_) != 2:
+                raise ValueError(f"Model '{name}' is not a binary classifier")
+            if classes is None:
+                classes = model.classes_
+            elif not np.array_equal(model.classes_, classes):
+                raise ValueError(
+                    f"Model '{name}' has classes {model.classes_.tolist()}, expected {classes.tolist()}"
+                )
+
+        self.models = models
+        self.classes_ = classes
+        self.featurizers = {}
+        self.classifiers = {}
+        self.group_of = {}
+
+        for name, model in models.items():
+            if isinstance(model, Pipeline) and len(model.steps) == 2 \
+                    and hasattr(model[0], 'get_feature_names_out'):
+                key = feature_space_key(model[0])
+                self.featurizers.setdefault(key, model[0])
+                self.classifiers[name] = model[-1]
+            else:
+                key = f"model:{name}"
+                self.featurizers[key] = None
+                self.classifiers[name] = model
+            self.group_of[name] = key
+
+        logging.info(f"Multi-model scorer: {len(models)} models in {len(self.featurizers)} feature spaces")
+
+    def vectorize(self, texts, names=None, features=None):
+        """
+        Vectorize texts once per feature space used by the given models.
+
+        Args:
+            texts: List of article texts
+            names: Models that will be scored (default: all)
+            features: Already computed features to reuse, keyed by feature space
+
+        Returns:
+            dict: Feature matrices keyed by feature space
+        """
+        features = dict(features or {})
+        for name in names or self.models:
+            key = self.group_of[name]
+            if key not in features:
+                featurizer = self.featurizers[key]
+                features[key] = featurizer.transform(texts) if featurizer is not None else texts
+        return features
+
+    def score(self, features, names=None):
+        """
+        Compute decision scores from features returned by vectorize.
+
+        Returns:
+            dict: Decision scores keyed by model name
+        """
+        return {
+            name: self.classifiers[name].decision_function(features[self.group_of[name]])
+            for name in names or self.models
+        }
+
+    def decision_scores(self, texts, names=None):
+        return self.score(self.vectorize(texts, names), names)
+
+    def ensemble_decision_function(self, texts, names=None):
+        """
+        Average the decision scores of the given models.
+        """
+        return np.mean(list(self.decision_scores(texts, names).values()), axis=0)
+
+
+class ShadowMonitor:
+    """
+    Score a shadow model in a background thread and track how often it
+    agrees with the primary model.
+
+    The primary request only enqueues its texts, features and scores, so
+    shadow scoring never adds to primary-response latency. When the queue
+    is full, shadow comparisons are dropped rather than blocking requests.
+    Agreement is tracked per primary stage. "full" items were scored by the
+    primary on their full text, so their rate measures model disagreement
+    alone. "prefix" items were decided by a cascade on their prefix and are
+    submitted without features, so the shadow scores their full text in the
+    background and their rate covers the traffic the cascade served.
+    """
+
+    def __init__(self, scorer, primary="primary", shadow="shadow", max_pending=1000, log_every=100):
+        self.scorer = scorer
+        self.primary = primary
+        self.shadow = shadow
+        self.log_every = log_every
+        self.totals = {"full": 0, "prefix": 0}
+        self.agreed = {"full": 0, "prefix": 0}
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts, features, primary_scores, stage="full"):
+        """
+        Queue a primary scoring pass for shadow comparison.
+
+        Args:
+            texts: List of article texts
+            features: Features computed for the primary model, reused when the
+                shadow model shares its feature space
+            primary_scores: Decision scores served by the primary model
+            stage: Primary stage that decided the texts, "full" or "prefix"
+        """
+        try:
+            self._queue.put_nowait((texts, features, primary_scores, stage))
+        except queue.Full:
+            with self._lock:
+                self.dropped += len(texts)
+
+    def _run(self):
+        while True:
+            texts, features, primary_scores, stage = self._queue.get()
+            try:
+                self._compare(texts, features, primary_scores, stage)
+            except Exception as e:
+                logging.error(f"Error during shadow scoring: {str(e)}")
+
+    def _compare(self, texts, features, primary_scores, stage):
+        features = self.scorer.vectorize(texts, [self.shadow], features)
+        shadow_scores = self.scorer.score(features, [self.shadow])[self.shadow]
+        agreed = int(((np.asarray(primary_scores) > 0) == (shadow_scores > 0)).sum())
+
+        with self._lock:
+            previous = self.totals[stage]
+            self.totals[stage] += len(texts)
+            self.agreed[stage] += agreed
+
+        if previous // self.log_every != self.totals[stage] // self.log_every:
+            logging.info(f"Shadow agreement ({stage} stage): {self.agreement_rate(stage):.4f} "
+                         f"over {self.totals[stage]} predictions ({self.dropped} dropped)")
+
+    def agreement_rate(self, stage="full"):
+        total = self.totals[stage]
+        return self.agreed[stage] / total if total else None
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                stage: {'total': self.totals[stage], 'agreement_rate': self.agreement_rate(stage)}
+                for stage in self.totals
+            }
+            stats['dropped'] = self.dropped
+            stats['pending'] = self._queue.qsize()
+            return stats
@@ -0,0 +1,85 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+
+# Only one profiling window may run at a time
+_profile_lock = threading.Lock()
+
+# Background threads that never serve requests
+SKIPPED_THREADS = ("shadow-scorer",)
+
+# Leaf frames of threads that are idle, waiting for work or connections
+IDLE_LEAF_FRAMES = (
+    "selectors:select",
+    "socketserver:serve_forever",
+    "threading:wait",
+    "queue:get",
+)
+
+
+def _collapse_stack(frame, thread_name):
+    """
+    Build a collapsed stack line (root first, ';'-separated) for a frame,
+    or None if the thread is idle.
+    """
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '?')
+        names.append(f"{module}:{frame.f_code.co_name}".replace(';', ':'))
+        frame = frame.f_back
+    if names and names[0] in IDLE_LEAF_FRAMES:
+        return None
+    names.append(thread_name.replace(';', ':'))
+    return ';'.join(reversed(names))
+
+
+def sample_stacks(seconds, interval=0.005):
+    """
+    Sample the stacks of request threads for a time window.
+
+    The main thread, known background threads and threads idling in a
+    known wait are skipped so they do not dominate the flame graph.
+    Nothing is installed into the interpreter: stacks are only read from
+    sys._current_frames() while this function runs, so there is no cost
+    outside of a profiling window.
+
+    Args:
+        seconds: Length of the sampling window
+        interval: Delay between two samples in seconds
+
+    Returns:
+        Counter: Number of samples seen for each collapsed stack, or None if
+        another profiling window is already running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+
+    try:
+        skipped_ids = {threading.get_ident(), threading.main_thread().ident}
+        stacks = Counter()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                thread_name = thread_names.get(thread_id, str(thread_id))
+                if thread_id in skipped_ids or thread_name in SKIPPED_THREADS:
+                    continue
+                stack = _collapse_stack(frame, thread_name)
+                if stack is not None:
+                    stacks[stack] += 1
+            time.sleep(interval)
+
+        return stacks
+    finally:
+        _profile_lock.release()
+
+
+def format_collapsed(stacks):
+    """
+    Format sampled stacks in the collapsed format used by flamegraph.pl,
+    speedscope and similar flame graph tools.
+    """
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
@@ -6,10 +6,15 @@ Run this after starting the Flask server.
 
 import requests
 import json
+import re
 import sys
+from collections import Counter
 
 API_URL = "http://localhost:5000"
 
+# Must match the server's STREAM_MAX_LINE_BYTES (default 1 MB)
+STREAM_MAX_LINE_BYTES = 1024 * 1024
+
 def test_health():
     """Test health endpoint"""
     print("\n" + "="*60)
@@ -64,6 +69,7 @@ def test_single_prediction():
             assert response.status_code == 200
             assert "prediction" in data
             assert data["prediction"] in ["real", "fake"]
+            assert data["stage"] in ["prefix", "full"]
             assert 0 <= data["confidence"] <= 1
             
             print("✅ PASSED")
@@ -104,6 +110,152 @@ def test_batch_prediction():
         assert response.status_code == 200
         assert data["count"] == len(texts)
         assert len(data["predictions"]) == len(texts)
+        assert all(p["stage"] in ["prefix", "full"] for p in data["predictions"])
+        
+        print("✅ PASSED")
+        return True
+    except Exception as e:
+        print(f"❌ FAILED: {str(e)}")
+        return False
+
+
+def test_stream_batch_prediction():
+    """Test streaming NDJSON batch prediction endpoint"""
+    print("\n" + "="*60)
+    print("Testing: POST /api/batch-predict/stream")
+    print("="*60)
+    
+    try:
+        texts = [
+            "Real news about economic growth",
+            "Fake alien invasion story",
+            "Government announces new policy"
+        ] * 50
+        
+        lines = [json.dumps({"id": i, "text": text}) for i, text in enumerate(texts)]
+        # One malformed line and one line over the server's line limit
+        malformed_index, oversized_index = 40, 100
+        lines[malformed_index] = "not json"
+        lines[oversized_index] = json.dumps({"text": "x" * (STREAM_MAX_LINE_BYTES + 1)})
+        
+        # Send the body as a generator so it is uploaded with chunked encoding
+        def body():
+            for line in lines:
+                yield (line + "\n").encode()
+        
+        response = requests.post(
+            f"{API_URL}/api/batch-predict/stream",
+            data=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+            stream=True
+        )
+        
+        print(f"Status Code: {response.status_code}")
+        results = [json.loads(line) for line in response.iter_lines() if line]
+        print(f"Number of results: {len(results)}")
+        
+        assert response.status_code == 200
+        assert len(results) == len(lines)
+        # Results and errors must come back in input order
+        assert [r["index"] for r in results] == list(range(len(lines)))
+        
+        errors = {i for i, r in enumerate(results) if "error" in r}
+        assert errors == {malformed_index, oversized_index}
+        assert "exceeds" in results[oversized_index]["error"]
+        
+        predictions = [r for r in results if "error" not in r]
+        assert all(r["id"] == r["index"] for r in predictions)
+        assert all(r["prediction"] in ["real", "fake"] for r in predictions)
+        assert all(r["stage"] in ["prefix", "full"] for r in predictions)
+        
+        print("✅ PASSED")
+        return True
+    except Exception as e:
+        print(f"❌ FAILED: {str(e)}")
+        return False
+
+
+def build_count_vector(text, contract):
+    """Tokenize text client-side following the published feature contract"""
+    tokenization = contract["tokenization"]
+    if tokenization["lowercase"]:
+        text = text.lower()
+    tokens = re.findall(tokenization["token_pattern"], text)
+    if isinstance(tokenization["stop_words"], list):
+        tokens = [t for t in tokens if t not in tokenization["stop_words"]]
+    
+    min_n, max_n = tokenization["ngram_range"]
+    terms = Counter()
+    for n in range(min_n, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            terms[contract["ngram_separator"].join(tokens[i:i + n])] += 1
+    
+    vocabulary = contract["vocabulary"]
+    known = [(vocabulary[term], count) for term, count in terms.items() if term in vocabulary]
+    return {
+        "term_ids": [term_id for term_id, _ in known],
+        "counts": [count for _, count in known]
+    }
+
+
+def test_featurized_prediction():
+    """Test feature contract and pre-featurized prediction endpoints"""
+    print("\n" + "="*60)
+    print("Testing: GET /api/features + POST /api/predict/features")
+    print("="*60)
+    
+    try:
+        text = "NASA secretly admitted that the Moon landing was faked and astronauts never left Earth."
+        
+        response = requests.get(f"{API_URL}/api/features")
+        print(f"Status Code: {response.status_code}")
+        contract = response.json()
+        print(f"Vocabulary size: {contract['n_features']}")
+        assert response.status_code == 200
+        assert contract["tokenization"]["analyzer"] == "word"
+        assert not contract["custom_preprocessing"]
+        
+        vector = build_count_vector(text, contract)
+        response = requests.post(
+            f"{API_URL}/api/predict/features",
+            json={"feature_space": contract["feature_space"], "vectors": [vector]}
+        )
+        print(f"Status Code: {response.status_code}")
+        featurized = response.json()["predictions"][0]
+        
+        expected = requests.post(f"{API_URL}/api/predict", json={"text": text}).json()
+        print(f"Prediction: {featurized['prediction']} (text endpoint: {expected['prediction']})")
+        assert response.status_code == 200
+        assert featurized["prediction"] == expected["prediction"]
+        
+        # Vectors built for another model must be rejected
+        response = requests.post(
+            f"{API_URL}/api/predict/features",
+            json={"feature_space": "not-the-loaded-model", "vectors": [vector]}
+        )
+        assert response.status_code == 409
+        
+        # Term ids outside of the vocabulary must be rejected
+        response = requests.post(
+            f"{API_URL}/api/predict/features",
+            json={
+                "feature_space": contract["feature_space"],
+                "vectors": [{"term_ids": [contract["n_features"]], "counts": [1]}]
+            }
+        )
+        assert response.status_code == 400
+        assert "Term ids" in response.json()["error"]
+        
+        # The feature space is required
+        response = requests.post(f"{API_URL}/api/predict/features", json={"vectors": [vector]})
+        assert response.status_code == 400
+        
+        # The contract can be revalidated through its ETag
+        response = requests.get(
+            f"{API_URL}/api/features",
+            headers={"If-None-Match": requests.get(f"{API_URL}/api/features").headers["ETag"]}
+        )
+        assert response.status_code == 304
         
         print("✅ PASSED")
         return True
@@ -177,6 +329,8 @@ def main():
         "Health Check": test_health(),
         "Single Prediction": test_single_prediction(),
         "Batch Prediction": test_batch_prediction(),
+        "Streaming Batch Prediction": test_stream_batch_prediction(),
+        "Pre-featurized Prediction": test_featurized_prediction(),
         "Error Handling": test_error_handling(),
     }
     
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the cascade calibration math.
+Trains a small pipeline on synthetic articles, so no dataset is needed.
+"""
+
+import random
+import sys
+
+import numpy as np
+
+from src.cascade import calibrate_cascade, cascade_decision_scores
+from test_model_compaction import build_pipeline
+
+# Synthetic articles have 20 to 200 tokens, so this mixes short and long texts
+PREFIX_TOKENS = 40
+TARGET_AGREEMENTS = (0.9, 0.95, 0.99, 1.0)
+
+
+def build_calibration_texts(texts):
+    """
+    Add articles whose opening contradicts the rest of the text, so some
+    prefix predictions disagree with full-text scoring.
+    """
+    rng = random.Random(42)
+    real_words = "government reform bill passed senate economy report official minister said".split()
+    fake_words = "shocking secret aliens hoax conspiracy exposed miracle truth they hide".split()
+
+    misleading = []
+    for _ in range(100):
+        opening, body = (fake_words, real_words) if rng.random() < 0.5 else (real_words, fake_words)
+        n_opening = rng.randint(5, PREFIX_TOKENS)
+        words = [rng.choice(opening) for _ in range(n_opening)]
+        words += [rng.choice(body) for _ in range(rng.randint(PREFIX_TOKENS, 4 * PREFIX_TOKENS))]
+        misleading.append(" ".join(words))
+    return list(texts) + misleading
+
+
+def test_calibration_matches_cascade():
+    """Calibrated thresholds meet the target and report the real exit rate"""
+    print("\n" + "="*60)
+    print("Testing: calibrate_cascade matches cascade_decision_scores")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    texts = build_calibration_texts(texts)
+    full_predictions = pipeline.decision_function(texts) > 0
+
+    for target in TARGET_AGREEMENTS:
+        config = calibrate_cascade(pipeline, texts, PREFIX_TOKENS, target)
+        scores, stages = cascade_decision_scores(pipeline, texts, PREFIX_TOKENS, config['threshold'])
+        agreement = np.mean((scores > 0) == full_predictions)
+        exit_rate = stages.count("prefix") / len(texts)
+        print(f"target {target}: agreement {agreement:.4f}, "
+              f"exit rate {exit_rate:.4f} (reported {config['early_exit_rate']:.4f})")
+
+        assert config['agreement'] >= target
+        assert agreement >= target
+        assert np.isclose(agreement, config['agreement'])
+        assert exit_rate == config['early_exit_rate']
+
+    print("✅ PASSED")
+    return True
+
+
+def test_no_threshold_scores_in_full():
+    """A None threshold sends every text to the full-text stage"""
+    print("\n" + "="*60)
+    print("Testing: cascade_decision_scores with threshold=None")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    scores, stages = cascade_decision_scores(pipeline, texts, PREFIX_TOKENS, None)
+
+    assert stages == ["full"] * len(texts)
+    assert np.allclose(scores, pipeline.decision_function(texts))
+
+    print("✅ PASSED")
+    return True
+
+
+def main():
+    """Run all tests"""
+    results = {}
+    for name, test in [
+        ("Calibration", test_calibration_matches_cascade),
+        ("No Threshold", test_no_threshold_scores_in_full),
+    ]:
+        try:
+            results[name] = test()
+        except AssertionError as e:
+            print(f"❌ FAILED: {str(e)}")
+            results[name] = False
+
+    passed = sum(results.values())
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the model compaction math.
+Trains a small pipeline on synthetic articles, so no dataset is needed.
+"""
+
+import random
+import sys
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+from src.model_compaction import compact_pipeline
+
+# Maximum decision score error allowed for each storage dtype
+TOLERANCES = {"float16": 0.01, "int8": 0.05}
+
+
+def build_pipeline():
+    """Train a small TF-IDF + LinearSVC pipeline on synthetic articles"""
+    rng = random.Random(23)
+    real_words = "government reform bill passed senate economy report official minister said".split()
+    fake_words = "shocking secret aliens hoax conspiracy exposed miracle truth they hide".split()
+    common_words = "the a of and to in is was news today people".split()
+
+    def article(words):
+        return " ".join(rng.choice(words + common_words) for _ in range(rng.randint(20, 200)))
+
+    texts = [article(real_words) for _ in range(200)] + [article(fake_words) for _ in range(200)]
+    labels = ['real'] * 200 + ['fake'] * 200
+
+    pipeline = Pipeline([
+        ('preprocessor', TfidfVectorizer(ngram_range=(1, 2), max_df=0.8, min_df=5)),
+        ('classifier', LinearSVC(random_state=23, max_iter=2000))
+    ])
+    pipeline.fit(texts, labels)
+    return pipeline, texts
+
+
+def test_zero_threshold_matches_pipeline():
+    """Compaction without pruning only loses quantization precision"""
+    print("\n" + "="*60)
+    print("Testing: compact_pipeline(threshold=0) matches the pipeline")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    expected = pipeline.decision_function(texts)
+
+    for dtype, tolerance in TOLERANCES.items():
+        compact = compact_pipeline(pipeline, threshold=0, dtype=dtype)
+        error = np.abs(compact.decision_function(texts) - expected).max()
+        print(f"{dtype}: max decision score error {error:.6f}")
+
+        assert compact.n_features == len(pipeline.named_steps['classifier'].coef_[0])
+        assert error <= tolerance
+        assert np.array_equal(compact.predict(texts), pipeline.predict(texts))
+
+    print("✅ PASSED")
+    return True
+
+
+def test_threshold_drops_features_below_it():
+    """A positive threshold keeps exactly the features at or above it"""
+    print("\n" + "="*60)
+    print("Testing: compact_pipeline(threshold>0) prunes the vocabulary")
+    print("="*60)
+
+    pipeline, _ = build_pipeline()
+    coef = pipeline.named_steps['classifier'].coef_[0]
+    feature_names = pipeline.named_steps['preprocessor'].get_feature_names_out()
+    threshold = float(np.median(np.abs(coef)))
+
+    compact = compact_pipeline(pipeline, threshold=threshold)
+    expected = {feature_names[i] for i in np.flatnonzero(np.abs(coef) >= threshold)}
+    kept = set(compact.vectorizer.vocabulary_)
+    print(f"Kept {len(kept)}/{len(coef)} features")
+
+    assert kept == expected
+    assert compact.n_features == len(expected)
+    assert sorted(compact.vectorizer.vocabulary_.values()) == list(range(len(expected)))
+
+    print("✅ PASSED")
+    return True
+
+
+def main():
+    """Run all tests"""
+    results = {}
+    for name, test in [
+        ("Zero Threshold", test_zero_threshold_matches_pipeline),
+        ("Pruning Threshold", test_threshold_drops_features_below_it),
+    ]:
+        try:
+            results[name] = test()
+        except AssertionError as e:
+            print(f"❌ FAILED: {str(e)}")
+            results[name] = False
+
+    passed = sum(results.values())
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
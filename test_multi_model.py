@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script to verify multi-model scoring and shadow monitoring.
+Trains small pipelines on synthetic articles, so no dataset is needed.
+"""
+
+import copy
+import sys
+import threading
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from src.model_compaction import compact_pipeline
+from src.multi_model import MultiModelScorer, ShadowMonitor
+from test_model_compaction import build_pipeline
+
+
+class BlockingModel:
+    """Binary model whose decision_function waits until released"""
+
+    def __init__(self, classes):
+        self.classes_ = classes
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def decision_function(self, texts):
+        self.started.set()
+        self.release.wait(timeout=10)
+        return np.ones(len(texts))
+
+
+def count_transform_calls(vectorizer, calls):
+    """Wrap a vectorizer's transform so every call is recorded"""
+    transform = vectorizer.transform
+
+    def counted_transform(texts):
+        calls.append(vectorizer)
+        return transform(texts)
+
+    vectorizer.transform = counted_transform
+
+
+def test_shared_vectorizer_is_grouped():
+    """Pipelines with the same vectorizer are vectorized once"""
+    print("\n" + "="*60)
+    print("Testing: shared feature space is vectorized once")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    labels = pipeline.predict(texts)
+
+    # An equal but separate vectorizer, as in a retrained candidate pipeline
+    vectorizer = copy.deepcopy(pipeline[0])
+    candidate = Pipeline([
+        ('preprocessor', vectorizer),
+        ('classifier', LogisticRegression().fit(vectorizer.transform(texts), labels))
+    ])
+
+    calls = []
+    count_transform_calls(pipeline[0], calls)
+    count_transform_calls(vectorizer, calls)
+
+    scorer = MultiModelScorer({'primary': pipeline, 'candidate': candidate})
+    scores = scorer.decision_scores(texts)
+
+    assert len(scorer.featurizers) == 1
+    assert scorer.group_of['primary'] == scorer.group_of['candidate']
+    assert len(calls) == 1
+    assert np.allclose(scores['primary'], pipeline.decision_function(texts))
+
+    print("✅ PASSED")
+    return True
+
+
+def test_other_models_get_own_group():
+    """Compact and non-pipeline models are scored on their own"""
+    print("\n" + "="*60)
+    print("Testing: compact and non-pipeline models get their own group")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    compact = compact_pipeline(pipeline, threshold=0)
+    other = BlockingModel(pipeline.classes_)
+    other.release.set()
+
+    scorer = MultiModelScorer({'primary': pipeline, 'compact': compact, 'other': other})
+    scores = scorer.decision_scores(texts)
+
+    assert len(scorer.featurizers) == 3
+    assert len(set(scorer.group_of.values())) == 3
+    assert np.allclose(scores['compact'], compact.decision_function(texts))
+    assert np.array_equal(scores['other'], np.ones(len(texts)))
+
+    print("✅ PASSED")
+    return True
+
+
+def test_mismatched_classes_are_rejected():
+    """Models with a different classes_ order cannot be combined"""
+    print("\n" + "="*60)
+    print("Testing: mismatched classes_ raise ValueError")
+    print("="*60)
+
+    pipeline, _ = build_pipeline()
+    reversed_model = BlockingModel(pipeline.classes_[::-1])
+
+    try:
+        MultiModelScorer({'primary': pipeline, 'shadow': reversed_model})
+    except ValueError as e:
+        print(f"Rejected: {e}")
+    else:
+        raise AssertionError("MultiModelScorer accepted mismatched classes_")
+
+    print("✅ PASSED")
+    return True
+
+
+def test_shadow_drops_when_queue_is_full():
+    """A full shadow queue drops work instead of blocking the caller"""
+    print("\n" + "="*60)
+    print("Testing: ShadowMonitor drops work when its queue is full")
+    print("="*60)
+
+    pipeline, texts = build_pipeline()
+    shadow = BlockingModel(pipeline.classes_)
+    scorer = MultiModelScorer({'primary': pipeline, 'shadow': shadow})
+    monitor = ShadowMonitor(scorer, max_pending=1)
+
+    try:
+        # The first pass occupies the shadow thread, the second fills the queue
+        monitor.submit(texts[:2], {}, [1.0, 1.0])
+        assert shadow.started.wait(timeout=5)
+        monitor.submit(texts[:3], {}, [1.0, 1.0, 1.0])
+
+        start = time.perf_counter()
+        monitor.submit(texts[:4], {}, [1.0] * 4)
+        elapsed = time.perf_counter() - start
+
+        stats = monitor.stats()
+        print(f"Stats while blocked: {stats}")
+        assert elapsed < 0.5
+        assert stats['dropped'] == 4
+        assert stats['pending'] == 1
+    finally:
+        shadow.release.set()
+
+    # Both accepted passes are compared once the shadow is released
+    deadline = time.monotonic() + 5
+    while monitor.stats()['full']['total'] < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert monitor.stats()['full'] == {'total': 5, 'agreement_rate': 1.0}
+
+    print("✅ PASSED")
+    return True
+
+
+def main():
+    """Run all tests"""
+    results = {}
+    for name, test in [
+        ("Shared Vectorizer", test_shared_vectorizer_is_grouped),
+        ("Separate Groups", test_other_models_get_own_group),
+        ("Mismatched Classes", test_mismatched_classes_are_rejected),
+        ("Shadow Queue Full", test_shadow_drops_when_queue_is_full),
+    ]:
+        try:
+            results[name] = test()
+        except AssertionError as e:
+            print(f"❌ FAILED: {str(e)}")
+            results[name] = False
+
+    passed = sum(results.values())
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
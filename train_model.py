@@ -15,6 +15,52 @@ from src.logger import logging
 from src.model_serialization import save_model
 
 
+def load_dataset():
+    """
+    Load the real and fake news datasets into one shuffled dataframe.
+    
+    Returns:
+        tuple: (X, y) combined article text and labels
+    """
+    logging.info("Loading dataset...")
+    real = pd.read_csv('notebook/data/True.csv')
+    fake = pd.read_csv('notebook/data/Fake.csv')
+    
+    # Add labels
+    real['label'] = 'real'
+    fake['label'] = 'fake'
+    
+    # Combine datasets
+    data = pd.concat([real, fake], ignore_index=True)
+    data = data.sample(frac=1, random_state=42).reset_index(drop=True)
+    
+    logging.info(f"Dataset loaded: {len(data)} samples")
+    
+    # Prepare features and labels
+    data['combined_text'] = data['title'] + " " + data['text']
+    return data['combined_text'], data['label']
+
+
+def split_dataset(X, y):
+    """
+    Split the dataset into the train and test sets used for training.
+    
+    Args:
+        X: Article texts
+        y: Labels
+    
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test)
+    """
+    logging.info("Splitting data into train and test sets...")
+    return train_test_split(
+        X, y,
+        test_size=0.2,
+        random_state=23,
+        stratify=y
+    )
+
+
 def train_fake_news_model():
     """
     Train the fake news detection model and save it.
@@ -26,33 +72,10 @@ def train_fake_news_model():
         logging.info("Starting model training...")
         
         # Load data
-        logging.info("Loading dataset...")
-        real = pd.read_csv('notebook/data/True.csv')
-        fake = pd.read_csv('notebook/data/Fake.csv')
-        
-        # Add labels
-        real['label'] = 'real'
-        fake['label'] = 'fake'
-        
-        # Combine datasets
-        data = pd.concat([real, fake], ignore_index=True)
-        data = data.sample(frac=1, random_state=42).reset_index(drop=True)
-        
-        logging.info(f"Dataset loaded: {len(data)} samples")
-        
-        # Prepare features and labels
-        data['combined_text'] = data['title'] + " " + data['text']
-        X = data['combined_text']
-        y = data['label']
+        X, y = load_dataset()
         
         # Split data
-        logging.info("Splitting data into train and test sets...")
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=0.2,
-            random_state=23,
-            stratify=y
-        )
+        X_train, X_test, y_train, y_test = split_dataset(X, y)
         
         logging.info(f"Training set: {len(X_train)}, Test set: {len(X_test)}")
         